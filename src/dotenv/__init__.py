@@ -1,7 +1,7 @@
 from typing import Any, Optional
 
 from .main import (dotenv_values, find_dotenv, get_key, load_dotenv, set_key,
-                   unset_key)
+                   set_keys, unset_key)
 
 
 def load_ipython_extension(ipython: Any) -> None:
@@ -44,6 +44,7 @@ __all__ = ['get_cli_string',
            'dotenv_values',
            'get_key',
            'set_key',
+           'set_keys',
            'unset_key',
            'find_dotenv',
            'load_ipython_extension']
@@ -1,3 +1,4 @@
+import functools
 import io
 import logging
 import os
@@ -10,7 +11,7 @@ from typing import (IO, Dict, Iterable, Iterator, Mapping, Optional, Tuple,
                     Union)
 
 from .parser import Binding, parse_stream
-from .variables import parse_variables
+from .variables import Atom, parse_variables
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +20,23 @@ if sys.version_info >= (3, 6):
 else:
     _PathLike = str
 
+if sys.version_info >= (3, 7):
+    # Plain dicts preserve insertion order as of Python 3.7.
+    _OrderedDict = dict
+else:
+    _OrderedDict = OrderedDict
+
+_MISSING = object()
+
+_find_cache = {}  # type: Dict[Tuple[str, str], str]
+
 
-def with_warn_for_invalid_lines(mappings: Iterator[Binding]) -> Iterator[Binding]:
-    for mapping in mappings:
-        if mapping.error:
-            logger.warning(
-                "Python-dotenv could not parse statement starting at line %s",
-                mapping.original.line,
-            )
-        yield mapping
+def warn_for_invalid_line(mapping: Binding) -> None:
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(
+            "Python-dotenv could not parse statement starting at line %s",
+            mapping.original.line,
+        )
 
 
 class DotEnv():
@@ -50,9 +59,19 @@ class DotEnv():
 
     @contextmanager
     def _get_stream(self) -> Iterator[IO[str]]:
-        if self.dotenv_path and os.path.isfile(self.dotenv_path):
-            with io.open(self.dotenv_path, encoding=self.encoding) as stream:
-                yield stream
+        content = None  # type: Optional[str]
+        if self.dotenv_path:
+            try:
+                with io.open(self.dotenv_path, encoding=self.encoding) as stream:
+                    content = stream.read()
+            except OSError:
+                # Like before, only fail for regular files that can't be read.  Anything
+                # else (missing, a directory, a bad path, ...) is treated as absent.
+                if os.path.isfile(self.dotenv_path):
+                    raise
+
+        if content is not None:
+            yield io.StringIO(content)
         elif self.stream is not None:
             yield self.stream
         else:
@@ -65,21 +84,23 @@ class DotEnv():
 
     def dict(self) -> Dict[str, Optional[str]]:
         """Return dotenv as dict"""
-        if self._dict:
+        if self._dict is not None:
             return self._dict
 
         raw_values = self.parse()
 
         if self.interpolate:
-            self._dict = OrderedDict(resolve_variables(raw_values, override=self.override))
+            self._dict = _OrderedDict(resolve_variables(raw_values, override=self.override))
         else:
-            self._dict = OrderedDict(raw_values)
+            self._dict = _OrderedDict(raw_values)
 
         return self._dict
 
     def parse(self) -> Iterator[Tuple[str, Optional[str]]]:
         with self._get_stream() as stream:
-            for mapping in with_warn_for_invalid_lines(parse_stream(stream)):
+            for mapping in parse_stream(stream):
+                if mapping.error:
+                    warn_for_invalid_line(mapping)
                 if mapping.key is not None:
                     yield mapping.key, mapping.value
 
@@ -87,23 +108,23 @@ class DotEnv():
         """
         Load the current dotenv as system environment variable.
         """
-        for k, v in self.dict().items():
-            if k in os.environ and not self.override:
-                continue
-            if v is not None:
-                os.environ[k] = v
+        override = self.override
+        os.environ.update([
+            (k, v) for k, v in self.dict().items()
+            if v is not None and (override or k not in os.environ)
+        ])
 
         return True
 
     def get(self, key: str) -> Optional[str]:
         """
         """
-        data = self.dict()
+        value = self.dict().get(key, _MISSING)
 
-        if key in data:
-            return data[key]
+        if value is not _MISSING:
+            return value  # type: ignore
 
-        if self.verbose:
+        if self.verbose and logger.isEnabledFor(logging.WARNING):
             logger.warning("Key %s not found in %s.", key, self.dotenv_path)
 
         return None
@@ -115,17 +136,46 @@ def get_key(dotenv_path: Union[str, _PathLike], key_to_get: str) -> Optional[str
 
     If the .env path given doesn't exist, fails
     """
-    return DotEnv(dotenv_path, verbose=True).get(key_to_get)
+    raw_values = list(DotEnv(dotenv_path, verbose=True).parse())
+    (found, value) = _find_key(raw_values, key_to_get)
+
+    if found and value is not None and "$" in value:
+        # The value may refer to other variables, so resolve the bindings read above.
+        return resolve_variables(raw_values, override=True)[key_to_get]
+
+    if not found and logger.isEnabledFor(logging.WARNING):
+        logger.warning("Key %s not found in %s.", key_to_get, dotenv_path)
+
+    return value
+
+
+def _find_key(
+    values: Iterable[Tuple[str, Optional[str]]],
+    key: str,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Look up the raw value of a key without resolving the other variables.
+
+    The last binding wins, like in `DotEnv.dict`, so all the values are scanned.
+    """
+    found = False
+    value = None  # type: Optional[str]
+    for (name, raw_value) in values:
+        if name == key:
+            found = True
+            value = raw_value
+    return (found, value)
 
 
 @contextmanager
 def rewrite(path: Union[str, _PathLike]) -> Iterator[Tuple[IO[str], IO[str]]]:
     try:
-        if not os.path.isfile(path):
-            with io.open(path, "w+") as source:
-                source.write("")
         with tempfile.NamedTemporaryFile(mode="w+", delete=False) as dest:
-            with io.open(path) as source:
+            try:
+                source = io.open(path)
+            except FileNotFoundError:
+                source = io.open(path, "w+")
+            with source:
                 yield (source, dest)  # type: ignore
     except BaseException:
         if os.path.isfile(dest.name):
@@ -135,6 +185,24 @@ def rewrite(path: Union[str, _PathLike]) -> Iterator[Tuple[IO[str], IO[str]]]:
         shutil.move(dest.name, path)
 
 
+def _format_line(key: str, value: str, quote_mode: str, export: bool) -> str:
+    quote = (
+        quote_mode == "always"
+        or (quote_mode == "auto" and not value.isalnum())
+    )
+
+    if quote:
+        if "'" in value:
+            value = value.replace("'", "\\'")
+        value_out = "'{}'".format(value)
+    else:
+        value_out = value
+    if export:
+        return 'export {}={}\n'.format(key, value_out)
+    else:
+        return "{}={}\n".format(key, value_out)
+
+
 def set_key(
     dotenv_path: Union[str, _PathLike],
     key_to_set: str,
@@ -148,35 +216,48 @@ def set_key(
     If the .env path given doesn't exist, fails instead of risking creating
     an orphan .env somewhere in the filesystem
     """
+    set_keys(dotenv_path, {key_to_set: value_to_set}, quote_mode=quote_mode, export=export)
+
+    return True, key_to_set, value_to_set
+
+
+def set_keys(
+    dotenv_path: Union[str, _PathLike],
+    values_to_set: Mapping[str, str],
+    quote_mode: str = "always",
+    export: bool = False,
+) -> Tuple[bool, Mapping[str, str]]:
+    """
+    Adds or Updates several key/values to the given .env
+
+    The file is parsed and rewritten only once, which is faster than calling
+    `set_key` for each key.  Keys not already in the file are appended in the
+    order of `values_to_set`.
+    """
     if quote_mode not in ("always", "auto", "never"):
         raise ValueError("Unknown quote_mode: {}".format(quote_mode))
 
-    quote = (
-        quote_mode == "always"
-        or (quote_mode == "auto" and not value_to_set.isalnum())
+    lines_out = _OrderedDict(
+        (key, _format_line(key, value, quote_mode, export))
+        for (key, value) in values_to_set.items()
     )
 
-    if quote:
-        value_out = "'{}'".format(value_to_set.replace("'", "\\'"))
-    else:
-        value_out = value_to_set
-    if export:
-        line_out = 'export {}={}\n'.format(key_to_set, value_out)
-    else:
-        line_out = "{}={}\n".format(key_to_set, value_out)
-
     with rewrite(dotenv_path) as (source, dest):
-        replaced = False
-        for mapping in with_warn_for_invalid_lines(parse_stream(source)):
-            if mapping.key == key_to_set:
-                dest.write(line_out)
-                replaced = True
+        replaced = set()
+        for mapping in parse_stream(source):
+            if mapping.error:
+                warn_for_invalid_line(mapping)
+            key = mapping.key
+            if key is not None and key in lines_out:
+                dest.write(lines_out[key])
+                replaced.add(key)
             else:
                 dest.write(mapping.original.string)
-        if not replaced:
-            dest.write(line_out)
+        for (key, line_out) in lines_out.items():
+            if key not in replaced:
+                dest.write(line_out)
 
-    return True, key_to_set, value_to_set
+    return True, values_to_set
 
 
 def unset_key(
@@ -196,7 +277,9 @@ def unset_key(
 
     removed = False
     with rewrite(dotenv_path) as (source, dest):
-        for mapping in with_warn_for_invalid_lines(parse_stream(source)):
+        for mapping in parse_stream(source):
+            if mapping.error:
+                warn_for_invalid_line(mapping)
             if mapping.key == key_to_unset:
                 removed = True
             else:
@@ -209,27 +292,34 @@ def unset_key(
     return removed, key_to_unset
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_variables_cached(value: str) -> Tuple[Atom, ...]:
+    return tuple(parse_variables(value))
+
+
 def resolve_variables(
     values: Iterable[Tuple[str, Optional[str]]],
     override: bool,
 ) -> Mapping[str, Optional[str]]:
     new_values = {}  # type: Dict[str, Optional[str]]
 
+    # Copy `os.environ` once and keep the copy up to date with each new binding,
+    # instead of merging both mappings again for every value.
+    environ = os.environ
+    env = dict(environ)  # type: Dict[str, Optional[str]]
+    parse = _parse_variables_cached
+
     for (name, value) in values:
-        if value is None:
-            result = None
+        if value is None or "$" not in value:
+            # Nothing to interpolate.
+            result = value
         else:
-            atoms = parse_variables(value)
-            env = {}  # type: Dict[str, Optional[str]]
-            if override:
-                env.update(os.environ)  # type: ignore
-                env.update(new_values)
-            else:
-                env.update(new_values)
-                env.update(os.environ)  # type: ignore
+            atoms = parse(value)
             result = "".join(atom.resolve(env) for atom in atoms)
 
         new_values[name] = result
+        if override or name not in environ:
+            env[name] = result
 
     return new_values
 
@@ -244,12 +334,23 @@ def _walk_to_root(path: str) -> Iterator[str]:
     if os.path.isfile(path):
         path = os.path.dirname(path)
 
-    last_dir = None
     current_dir = os.path.abspath(path)
-    while last_dir != current_dir:
+    while True:
         yield current_dir
-        parent_dir = os.path.abspath(os.path.join(current_dir, os.path.pardir))
-        last_dir, current_dir = current_dir, parent_dir
+        parent_dir = os.path.dirname(current_dir)
+        if parent_dir == current_dir:
+            break
+        current_dir = parent_dir
+
+
+_FROZEN = getattr(sys, 'frozen', False)  # type: bool
+
+
+@functools.lru_cache(maxsize=1)
+def _is_interactive() -> bool:
+    """ Decide whether this is running in a REPL or IPython notebook """
+    main = __import__('__main__', None, None, fromlist=['__file__'])
+    return not hasattr(main, '__file__')
 
 
 def find_dotenv(
@@ -261,14 +362,11 @@ def find_dotenv(
     Search in increasingly higher folders for the given file
 
     Returns path to the file if found, or an empty string otherwise
-    """
 
-    def _is_interactive():
-        """ Decide whether this is running in a REPL or IPython notebook """
-        main = __import__('__main__', None, None, fromlist=['__file__'])
-        return not hasattr(main, '__file__')
-
-    if usecwd or _is_interactive() or getattr(sys, 'frozen', False):
+    Found files are remembered per starting directory and filename as long as they
+    exist; call `find_dotenv.cache_clear()` if a closer .env file is created at runtime.
+    """
+    if usecwd or _FROZEN or _is_interactive():
         # Should work without __file__, e.g. in REPL or IPython notebook.
         path = os.getcwd()
     else:
@@ -282,15 +380,30 @@ def find_dotenv(
         frame_filename = frame.f_code.co_filename
         path = os.path.dirname(os.path.abspath(frame_filename))
 
-    for dirname in _walk_to_root(path):
-        check_path = os.path.join(dirname, filename)
-        if os.path.isfile(check_path):
-            return check_path
-
-    if raise_error_if_not_found:
+    cache_key = (filename, path)
+    result = _find_cache.get(cache_key, '')
+    if not result or not os.path.isfile(result):
+        # Only successful lookups are cached, so that a .env file created later is
+        # still found.
+        result = ''
+        _find_cache.pop(cache_key, None)
+        # A single stat per directory is cheaper than listing it with `os.scandir`,
+        # works in directories that can be traversed but not read, and follows the
+        # case sensitivity of the filesystem.
+        for dirname in _walk_to_root(path):
+            check_path = os.path.join(dirname, filename)
+            if os.path.isfile(check_path):
+                result = check_path
+                _find_cache[cache_key] = result
+                break
+
+    if not result and raise_error_if_not_found:
         raise IOError('File not found')
 
-    return ''
+    return result
+
+
+find_dotenv.cache_clear = _find_cache.clear  # type: ignore
 
 
 def load_dotenv(
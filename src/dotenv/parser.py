@@ -59,7 +59,10 @@ class Position:
 
     def advance(self, string: str) -> None:
         self.chars += len(string)
-        self.line += len(re.findall(_newline, string))
+        if "\r" in string:
+            self.line += len(re.findall(_newline, string))
+        else:
+            self.line += string.count("\n")
 
 
 class Error(Exception):
@@ -120,9 +123,15 @@ def parse_key(reader: Reader) -> Optional[str]:
     return key
 
 
+def strip_unquoted_value(part: str) -> str:
+    if "#" in part:
+        part = re.sub(r"\s+#.*", "", part)
+    return part.rstrip()
+
+
 def parse_unquoted_value(reader: Reader) -> str:
     (part,) = reader.read_regex(_unquoted_value)
-    return re.sub(r"\s+#.*", "", part).rstrip()
+    return strip_unquoted_value(part)
 
 
 def parse_value(reader: Reader) -> str:
@@ -139,8 +148,42 @@ def parse_value(reader: Reader) -> str:
         return parse_unquoted_value(reader)
 
 
+def parse_simple_binding(reader: Reader) -> Optional[Binding]:
+    """
+    Parse a plain `KEY=value` line without going through the full tokenizer.
+
+    Returns `None`, without consuming anything, if the line needs the full parser
+    (leading whitespace, quotes, `export`, `\\r` line endings, ...).
+    """
+    string = reader.string
+    start = reader.position.chars
+    end = string.find("\n", start)
+    end = len(string) if end == -1 else end + 1
+    line = string[start:end]
+    if "\r" in line:
+        return None
+
+    (key, sep, part) = line.rstrip("\n").partition("=")
+    if not sep or not key.isidentifier():
+        return None
+    part = part.lstrip()
+    if part[:1] in ("'", '"'):
+        return None
+
+    reader.position.advance(line)
+    return Binding(
+        key=key,
+        value=strip_unquoted_value(part),
+        original=reader.get_marked(),
+        error=False,
+    )
+
+
 def parse_binding(reader: Reader) -> Binding:
     reader.set_mark()
+    binding = parse_simple_binding(reader)
+    if binding is not None:
+        return binding
     try:
         reader.read_regex(_multiline_whitespace)
         if not reader.has_next():
@@ -52,6 +52,32 @@ def test_set_key(dotenv_file, before, key, value, expected, after):
     mock_warning.assert_not_called()
 
 
+@pytest.mark.parametrize(
+    "before,values,kwargs,after",
+    [
+        ("", {}, {}, ""),
+        ("", {"a": "b", "c": "d"}, {}, "a='b'\nc='d'\n"),
+        ("a=b\nc=d\n", {"c": "e", "a": "f"}, {}, "a='f'\nc='e'\n"),
+        ("a=b\n# c\n", {"d": "e", "a": "c"}, {}, "a='c'\n# c\nd='e'\n"),
+        ("a=b\nc=d\na=e\n", {"a": "f"}, {}, "a='f'\nc=d\na='f'\n"),
+        ("a=b\n", {"a": "c", "d": "e"}, {"export": True}, "export a='c'\nexport d='e'\n"),
+        ("", {"a": "b", "c": "d e"}, {"quote_mode": "auto"}, "a=b\nc='d e'\n"),
+        ("a=b\n", {"a": "c d"}, {"quote_mode": "never"}, "a=c d\n"),
+    ],
+)
+def test_set_keys(dotenv_file, before, values, kwargs, after):
+    logger = logging.getLogger("dotenv.main")
+    with open(dotenv_file, "w") as f:
+        f.write(before)
+
+    with mock.patch.object(logger, "warning") as mock_warning:
+        result = dotenv.set_keys(dotenv_file, values, **kwargs)
+
+    assert result == (True, values)
+    assert open(dotenv_file, "r").read() == after
+    mock_warning.assert_not_called()
+
+
 def test_set_key_permission_error(dotenv_file):
     os.chmod(dotenv_file, 0o000)
 
@@ -63,6 +89,18 @@ def test_set_key_permission_error(dotenv_file):
         assert fp.read() == ""
 
 
+def test_set_key_read_only_file(dotenv_file):
+    with open(dotenv_file, "w") as f:
+        f.write("a=b\n")
+    os.chmod(dotenv_file, 0o400)
+
+    result = dotenv.set_key(dotenv_file, "a", "c")
+
+    assert result == (True, "a", "c")
+    with open(dotenv_file, "r") as f:
+        assert f.read() == "a='c'\n"
+
+
 def test_get_key_no_file(tmp_path):
     nx_file = str(tmp_path / "nx")
     logger = logging.getLogger("dotenv.main")
@@ -118,6 +156,59 @@ def test_get_key_none(dotenv_file):
     mock_warning.assert_not_called()
 
 
+@pytest.mark.parametrize(
+    "content,expected,invalid_lines",
+    [
+        ("foo=bar\nfoo=baz", "baz", []),
+        ("a=b\nfoo=${a}", "b", []),
+        ("foo=${a:-c}", "c", []),
+        ("a=b\nc d\nfoo=${a}", "b", [2]),
+    ],
+)
+def test_get_key_resolved(dotenv_file, content, expected, invalid_lines):
+    logger = logging.getLogger("dotenv.main")
+    with open(dotenv_file, "w") as f:
+        f.write(content)
+
+    with mock.patch.dict(os.environ, {}, clear=True), \
+            mock.patch.object(logger, "warning") as mock_warning:
+        result = dotenv.get_key(dotenv_file, "foo")
+
+    assert result == expected
+    assert mock_warning.call_args_list == [
+        mock.call("Python-dotenv could not parse statement starting at line %s", line)
+        for line in invalid_lines
+    ]
+    if invalid_lines:
+        mock_warning.assert_called_once()
+
+
+def test_dotenv_values_invalid_line(dotenv_file):
+    logger = logging.getLogger("dotenv.main")
+    with open(dotenv_file, "w") as f:
+        f.write("a=b\nc d\ne=f")
+
+    with mock.patch.object(logger, "warning") as mock_warning:
+        result = dotenv.dotenv_values(dotenv_file)
+
+    assert result == {"a": "b", "e": "f"}
+    mock_warning.assert_called_once_with(
+        "Python-dotenv could not parse statement starting at line %s",
+        2,
+    )
+
+
+def test_dotenv_dict_parsed_once(dotenv_file):
+    env = dotenv.main.DotEnv(dotenv_file)
+
+    with mock.patch.object(env, "parse", wraps=env.parse) as mock_parse:
+        assert env.dict() == {}
+        assert env.dict() == {}
+        assert env.get("foo") is None
+
+    mock_parse.assert_called_once_with()
+
+
 def test_unset_with_value(dotenv_file):
     logger = logging.getLogger("dotenv.main")
     with open(dotenv_file, "w") as f:
@@ -212,6 +303,50 @@ def test_find_dotenv_found(tmp_path):
     assert result == str(dotenv_file)
 
 
+def test_find_dotenv_miss_not_cached(tmp_path):
+    (root, leaf) = prepare_file_hierarchy(tmp_path)
+    os.chdir(str(leaf))
+    assert dotenv.find_dotenv(usecwd=True) == ""
+    dotenv_file = root / ".env"
+    dotenv_file.write_bytes(b"TEST=test\n")
+
+    result = dotenv.find_dotenv(usecwd=True)
+
+    assert result == str(dotenv_file)
+
+
+def test_find_dotenv_cached(tmp_path):
+    (root, leaf) = prepare_file_hierarchy(tmp_path)
+    os.chdir(str(leaf))
+    root_file = root / ".env"
+    root_file.write_bytes(b"TEST=test\n")
+    assert dotenv.find_dotenv(usecwd=True) == str(root_file)
+    leaf_file = leaf / ".env"
+    leaf_file.write_bytes(b"TEST=test\n")
+
+    cached = dotenv.find_dotenv(usecwd=True)
+    root_file.unlink()
+    after_removal = dotenv.find_dotenv(usecwd=True)
+
+    assert cached == str(root_file)
+    assert after_removal == str(leaf_file)
+
+
+def test_find_dotenv_cache_clear(tmp_path):
+    (root, leaf) = prepare_file_hierarchy(tmp_path)
+    os.chdir(str(leaf))
+    root_file = root / ".env"
+    root_file.write_bytes(b"TEST=test\n")
+    assert dotenv.find_dotenv(usecwd=True) == str(root_file)
+    leaf_file = leaf / ".env"
+    leaf_file.write_bytes(b"TEST=test\n")
+
+    dotenv.find_dotenv.cache_clear()  # type: ignore
+    result = dotenv.find_dotenv(usecwd=True)
+
+    assert result == str(leaf_file)
+
+
 @mock.patch.dict(os.environ, {}, clear=True)
 def test_load_dotenv_existing_file(dotenv_file):
     with open(dotenv_file, "w") as f:
@@ -383,3 +518,21 @@ def test_dotenv_values_file_stream(dotenv_file):
         result = dotenv.dotenv_values(stream=f)
 
     assert result == {"a": "b"}
+
+
+def test_dotenv_values_directory(tmp_path):
+    result = dotenv.dotenv_values(str(tmp_path))
+
+    assert result == {}
+
+
+def test_dotenv_values_file_as_directory(dotenv_file):
+    result = dotenv.dotenv_values(os.path.join(dotenv_file, ".env"))
+
+    assert result == {}
+
+
+def test_dotenv_values_name_too_long(tmp_path):
+    result = dotenv.dotenv_values(str(tmp_path / ("a" * 1000)))
+
+    assert result == {}
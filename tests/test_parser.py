@@ -164,6 +164,14 @@ from dotenv.parser import Binding, Original, parse_stream
             Binding(key=u"a", value=u"b", original=Original(string=u'a=b', line=2), error=False),
         ],
     ),
+    (
+        u"a= b #c\nc=d=e\n\nf=\n",
+        [
+            Binding(key=u"a", value=u"b", original=Original(string=u"a= b #c\n", line=1), error=False),
+            Binding(key=u"c", value=u"d=e", original=Original(string=u"c=d=e\n", line=2), error=False),
+            Binding(key=u"f", value=u"", original=Original(string=u"\nf=\n", line=3), error=False),
+        ],
+    ),
 ])
 def test_parse_stream(test_input, expected):
     result = parse_stream(io.StringIO(test_input))